@@ -10,21 +10,187 @@ Created: 2026-01-13
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
 import json
+import calendar
+import math
 import os
 import csv
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+import operator
+import gzip
 import sqlite3
+import threading
 from pathlib import Path
+from collections import Counter, defaultdict
+from functools import lru_cache
 from tkcalendar import DateEntry
 import webbrowser
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+# Asset record fields, in display and storage column order
+ASSET_FIELDS = ("id", "name", "type", "status", "owner", "location",
+                "acquisition_date", "release_date", "cost", "warranty", "notes")
+
+# Row tuple of a (normalized) asset in ASSET_FIELDS order, for the tree, database and CSV
+asset_values = operator.itemgetter(*ASSET_FIELDS)
+
+# Row tuple shown in the search results tree
+search_result_values = operator.itemgetter("id", "name", "type", "status", "owner", "location")
+
+# Label and asset field of each row in the single-asset PDF table
+PDF_FIELDS = (
+    ("Asset ID", "id"),
+    ("Name", "name"),
+    ("Type", "type"),
+    ("Status", "status"),
+    ("Owner", "owner"),
+    ("Location", "location"),
+    ("Acquisition Date", "acquisition_date"),
+    ("Release Date", "release_date"),
+    ("Cost", "cost"),
+    ("Warranty (months)", "warranty"),
+    ("Notes", "notes")
+)
+
+# Search type shown in the Query tab -> indexed asset field
+SEARCH_FIELDS = {
+    "Asset ID": "id",
+    "Asset Name": "name",
+    "Owner": "owner",
+    "Status": "status",
+    "Location": "location",
+    "Asset Type": "type"
+}
+
+# Search type matching the term against every field of an asset
+ALL_FIELDS_SEARCH = "All Fields"
+
+
+def tree_sort_key(value):
+    """Sort key for asset tree columns: numbers numerically, then text case-insensitively."""
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        return (1, str(value).lower())
+
+
+@lru_cache(maxsize=4096)
+def parse_ymd(value):
+    """Parse a YYYY-MM-DD date; cached since assets often share acquisition dates."""
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def add_months(value, months):
+    """Add whole months to a date, clamping the day to the end of the target month."""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+@lru_cache(maxsize=None)
+def pdf_styles():
+    """Title and table styles for asset PDFs, built once on first export.
+
+    reportlab is imported here rather than at module level so it does not
+    slow down application startup.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=getSampleStyleSheet()['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1f77b4'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    return title_style, table_style
+
+
+def normalize_asset(asset):
+    """Return a copy of an asset record with every ASSET_FIELDS key present as a string.
+
+    Missing and null values become "", and numbers from hand-edited JSON or
+    SQLite rows become their text, so the indexes can lowercase every field.
+    """
+    record = {**dict.fromkeys(ASSET_FIELDS), **dict(asset)}
+    for field in ASSET_FIELDS:
+        value = record.get(field)
+        record[field] = "" if value is None else str(value)
+    return record
+
+
+def normalize_assets(records):
+    """Normalize asset records, keeping one record (the last) for each asset ID.
+
+    Records without an asset ID are left out, since the ID is both the
+    database key and the asset tree row ID (an empty row ID is the tree root).
+    Returns the assets, the number of records left out and the number of
+    earlier records replaced by a later one with the same ID.
+    """
+    by_id = {}
+    missing_ids = 0
+    duplicates = 0
+    for asset in map(normalize_asset, records):
+        if not asset["id"]:
+            missing_ids += 1
+        else:
+            if asset["id"] in by_id:
+                duplicates += 1
+            by_id[asset["id"]] = asset
+    return list(by_id.values()), missing_ids, duplicates
+
+
+def read_json_file(path):
+    """Read and parse a JSON file (gzip-compressed for .gz paths), using orjson when available."""
+    data = Path(path).read_bytes()
+    if str(path).endswith('.gz'):
+        data = gzip.decompress(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json_file(path, obj, indent=False):
+    """Serialize obj as JSON (compact unless indent) and atomically replace a JSON file with it.
+
+    Paths ending in .gz are gzip-compressed at level 1, which shrinks JSON
+    several-fold for little CPU time.
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    elif indent:
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        data = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if str(path).endswith('.gz'):
+        data = gzip.compress(data, compresslevel=1)
+    # Write to a sibling temp file and swap it in, so a crash never leaves a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 
 class AFMDWTaskManagementSystem:
     """
@@ -41,10 +207,34 @@ class AFMDWTaskManagementSystem:
         # Application data
         self.assets = []
         self.owners = {}
-        self.data_file = "afmdw_assets.json"
+        self.data_file = "afmdw_assets.json"  # Legacy store, migrated into db_file
         self.owners_file = "afmdw_owners.json"
         self.db_file = "afmdw_tasks.db"
         
+        # Asset indexes: lookup by ID, search indexes (field -> lowercase value
+        # -> assets by ID), lowercase all-fields search text, parsed
+        # warranty expiry dates and numeric costs by ID, plus numeric costs by
+        # ID grouped per asset type
+        self._assets_by_id = {}
+        self._search_index = {field: {} for field in SEARCH_FIELDS.values()}
+        self._search_blobs = {}
+        self._warranty_expiry = {}
+        self._asset_costs = {}
+        self._type_asset_costs = {}
+        
+        # Report cache, invalidated whenever an asset is saved
+        self._report_cache = {}
+        self._assets_version = 0
+        
+        # Owners version, so the owner combobox is only refreshed after a change
+        self._owners_version = 0
+        self._last_owners_version = None
+        
+        # Deferred writes: asset rows are committed and owners saved in bursts
+        self._save_pending = False
+        self._save_after_id = None
+        self._owners_dirty = False
+        
         # Initialize database
         self.init_database()
         
@@ -67,12 +257,60 @@ class AFMDWTaskManagementSystem:
         
         # Build UI
         self.build_ui()
+        
+        # Flush pending writes and close the database when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Flush pending writes, release the database connection and close the application."""
+        try:
+            if self._save_pending:
+                self.root.after_cancel(self._save_after_id)
+                self._flush_save()
+            self.conn.close()
+        finally:
+            self.root.destroy()
+
+    def _mark_dirty(self):
+        """Schedule a flush of pending writes, coalescing bursts of edits."""
+        if not self._save_pending:
+            self._save_pending = True
+            self._save_after_id = self.root.after(500, self._flush_save)
+
+    def _flush_save(self):
+        """Commit pending asset and query-log writes and save owners if they changed."""
+        self._save_pending = False
+        try:
+            self.conn.commit()
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save data: {e}")
+        if self._owners_dirty:
+            self._owners_dirty = False
+            self.save_owners()
 
     def init_database(self):
-        """Initialize SQLite database for tasks and queries."""
+        """Initialize SQLite database for assets, tasks and queries."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
+            # The connection stays open for the lifetime of the application
+            self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            c = self.conn.cursor()
+            
+            # Assets table
+            c.execute('''CREATE TABLE IF NOT EXISTS assets
+                         (id TEXT PRIMARY KEY,
+                          name TEXT,
+                          type TEXT,
+                          status TEXT,
+                          owner TEXT,
+                          location TEXT,
+                          acquisition_date TEXT,
+                          release_date TEXT,
+                          cost TEXT,
+                          warranty TEXT,
+                          notes TEXT)''')
             
             # Tasks table
             c.execute('''CREATE TABLE IF NOT EXISTS tasks
@@ -93,48 +331,141 @@ class AFMDWTaskManagementSystem:
                           created_date TEXT,
                           results TEXT)''')
             
-            conn.commit()
-            conn.close()
+            self.conn.commit()
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to initialize database: {e}")
 
     def load_data(self):
-        """Load assets from JSON file."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    self.assets = json.load(f)
-            except Exception as e:
-                messagebox.showerror("Load Error", f"Failed to load data: {e}")
-                self.assets = []
-        else:
+        """Load assets from the database, migrating the legacy JSON file once."""
+        try:
+            c = self.conn.cursor()
+            c.execute(f"SELECT {', '.join(ASSET_FIELDS)} FROM assets ORDER BY rowid")
+            self.assets, missing_ids, _ = normalize_assets(zip(ASSET_FIELDS, row) for row in c.fetchall())
+            duplicates = 0
+            if not self.assets and not missing_ids and os.path.exists(self.data_file):
+                missing_ids, duplicates = self.migrate_json_data()
+            if missing_ids:
+                messagebox.showwarning("Load Warning", f"Skipped {missing_ids} asset record(s) without an asset ID")
+            if duplicates:
+                messagebox.showwarning("Load Warning",
+                                       f"Merged {duplicates} asset record(s) with a duplicate asset ID (the last one was kept)")
+        except Exception as e:
+            messagebox.showerror("Load Error", f"Failed to load data: {e}")
             self.assets = []
+        self.rebuild_indexes()
+
+    def migrate_json_data(self):
+        """Move assets from the legacy JSON data file into the database.
 
-    def save_data(self):
-        """Save assets to JSON file."""
+        Returns the number of records skipped for having no asset ID and the
+        number merged into a later duplicate; both stay in the renamed legacy file.
+        """
+        self.assets, missing_ids, duplicates = normalize_assets(read_json_file(self.data_file))
+        self._write_all_assets()
+        os.replace(self.data_file, self.data_file + ".migrated")
+        return missing_ids, duplicates
+
+    def rebuild_indexes(self):
+        """Rebuild the asset indexes from the full asset list."""
+        self._assets_by_id.clear()
+        self._search_blobs.clear()
+        self._warranty_expiry.clear()
+        self._asset_costs.clear()
+        self._type_asset_costs.clear()
+        for index in self._search_index.values():
+            index.clear()
+        for asset in self.assets:
+            self._index_asset(asset)
+
+    def _index_asset(self, asset):
+        """Add a single asset to the asset indexes."""
+        self._assets_by_id[asset["id"]] = asset
+        # Newline-separated so a term cannot match across two fields
+        self._search_blobs[asset["id"]] = "\n".join(str(asset.get(field, "")) for field in ASSET_FIELDS).lower()
+        try:
+            acq_date = parse_ymd(asset.get("acquisition_date", ""))
+            warranty_months = int(asset.get("warranty", 0) or 0)
+            self._warranty_expiry[asset["id"]] = add_months(acq_date, warranty_months)
+        except (TypeError, ValueError):
+            self._warranty_expiry[asset["id"]] = None
+        try:
+            self._asset_costs[asset["id"]] = float(asset.get("cost", 0) or 0)
+        except (TypeError, ValueError):
+            self._asset_costs[asset["id"]] = 0.0
+        asset_type = asset.get("type", "Unknown")
+        self._type_asset_costs.setdefault(asset_type, {})[asset["id"]] = self._asset_costs[asset["id"]]
+        for field, index in self._search_index.items():
+            index.setdefault(asset.get(field, "").lower(), {})[asset["id"]] = asset
+
+    def _unindex_asset(self, asset):
+        """Remove a single asset from the asset indexes."""
+        self._assets_by_id.pop(asset["id"], None)
+        self._search_blobs.pop(asset["id"], None)
+        self._warranty_expiry.pop(asset["id"], None)
+        self._asset_costs.pop(asset["id"], None)
+        asset_type = asset.get("type", "Unknown")
+        type_costs = self._type_asset_costs.get(asset_type)
+        if type_costs and type_costs.pop(asset["id"], None) is not None and not type_costs:
+            del self._type_asset_costs[asset_type]
+        for field, index in self._search_index.items():
+            key = asset.get(field, "").lower()
+            bucket = index.get(key)
+            if bucket and bucket.pop(asset["id"], None) is not None and not bucket:
+                del index[key]
+
+    def _invalidate_reports(self):
+        """Mark the asset list as changed so cached reports are rebuilt."""
+        self._assets_version += 1
+        self._report_cache.clear()
+
+    def _write_all_assets(self):
+        """Replace every stored asset row with the in-memory asset list."""
+        columns = ", ".join(ASSET_FIELDS)
+        placeholders = ", ".join("?" for _ in ASSET_FIELDS)
+        with self.conn:
+            self.conn.execute("DELETE FROM assets")
+            self.conn.executemany(f"INSERT INTO assets ({columns}) VALUES ({placeholders})",
+                                  map(asset_values, self.assets))
+
+    def save_asset_record(self, asset):
+        """Insert or update a single asset row in place; committed by the next deferred flush."""
+        self._invalidate_reports()
+        columns = ", ".join(ASSET_FIELDS)
+        placeholders = ", ".join("?" for _ in ASSET_FIELDS)
+        updates = ", ".join(f"{field}=excluded.{field}" for field in ASSET_FIELDS[1:])
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.assets, f, indent=4)
+            self.conn.execute(f"INSERT INTO assets ({columns}) VALUES ({placeholders}) "
+                              f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                              asset_values(asset))
+            self._mark_dirty()
         except Exception as e:
-            messagebox.showerror("Save Error", f"Failed to save data: {e}")
+            messagebox.showerror("Save Error", f"Failed to save asset: {e}")
+
+    def delete_asset_record(self, asset_id):
+        """Delete a single asset row; committed by the next deferred flush."""
+        self._invalidate_reports()
+        try:
+            self.conn.execute("DELETE FROM assets WHERE id = ?", (asset_id,))
+            self._mark_dirty()
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to delete asset: {e}")
 
     def load_owners(self):
         """Load owners from JSON file."""
         if os.path.exists(self.owners_file):
             try:
-                with open(self.owners_file, 'r') as f:
-                    self.owners = json.load(f)
+                self.owners = read_json_file(self.owners_file)
             except Exception as e:
                 messagebox.showerror("Load Error", f"Failed to load owners: {e}")
                 self.owners = {}
         else:
             self.owners = {}
+        self._owners_version += 1
 
     def save_owners(self):
         """Save owners to JSON file."""
         try:
-            with open(self.owners_file, 'w') as f:
-                json.dump(self.owners, f, indent=4)
+            write_json_file(self.owners_file, self.owners)
         except Exception as e:
             messagebox.showerror("Save Error", f"Failed to save owners: {e}")
 
@@ -148,22 +479,31 @@ class AFMDWTaskManagementSystem:
         self.notebook = ttk.Notebook(main_container)
         self.notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Assets tab
-        self.build_assets_tab()
-        
-        # Query tab
-        self.build_query_tab()
-        
-        # Reports tab
-        self.build_reports_tab()
-        
-        # Settings tab
-        self.build_settings_tab()
+        # Tabs are added up front, but only the Assets tab is built now;
+        # the others are built the first time they are selected
+        self._tab_builders = {}
+        tabs = (
+            ("Assets Management", self.build_assets_tab),
+            ("Query & Search", self.build_query_tab),
+            ("Reports & Analytics", self.build_reports_tab),
+            ("Settings & Tools", self.build_settings_tab)
+        )
+        for text, builder in tabs:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            self._tab_builders[str(frame)] = (builder, frame)
+        
+        self._on_tab_changed()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _on_tab_changed(self, event=None):
+        """Build the selected tab on its first activation."""
+        builder, frame = self._tab_builders.pop(self.notebook.select(), (None, None))
+        if builder is not None:
+            builder(frame)
 
-    def build_assets_tab(self):
+    def build_assets_tab(self, assets_frame):
         """Build the assets management tab."""
-        assets_frame = ttk.Frame(self.notebook)
-        self.notebook.add(assets_frame, text="Assets Management")
         
         # Input frame
         input_frame = ttk.LabelFrame(assets_frame, text="Asset Details", padding=10)
@@ -224,9 +564,13 @@ class AFMDWTaskManagementSystem:
         ttk.Button(button_frame, text="Update Asset", command=self.update_record).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Delete Asset", command=self.delete_asset).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Clear Form", command=self.clear_form).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Export to PDF", command=self.export_to_pdf).pack(side=tk.LEFT, padx=5)
+        self.pdf_button = ttk.Button(button_frame, text="Export to PDF", command=self.export_to_pdf)
+        self.pdf_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Export to CSV", command=self.export_to_csv).pack(side=tk.LEFT, padx=5)
         
+        # Shown only while a PDF export is running in the background
+        self.pdf_progress = ttk.Progressbar(button_frame, mode="indeterminate", length=120)
+        
         # Tree frame
         tree_frame = ttk.LabelFrame(assets_frame, text="Assets List", padding=5)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -263,7 +607,10 @@ class AFMDWTaskManagementSystem:
         
         for col in columns:
             self.tree.column(col, width=column_widths.get(col, 100), anchor=tk.W)
-            self.tree.heading(col, text=col, anchor=tk.W)
+            self.tree.heading(col, text=col, anchor=tk.W, command=lambda c=col: self.sort_tree(c))
+        self._tree_sort = None
+        # Row values currently shown in the tree, by asset ID (the row iid)
+        self._tree_rows = {}
         
         # Bind selection event
         self.tree.bind("<ButtonRelease-1>", self.on_tree_select)
@@ -279,10 +626,8 @@ class AFMDWTaskManagementSystem:
         # Refresh tree
         self.refresh_tree()
 
-    def build_query_tab(self):
+    def build_query_tab(self, query_frame):
         """Build the query and search tab."""
-        query_frame = ttk.Frame(self.notebook)
-        self.notebook.add(query_frame, text="Query & Search")
         
         # Query options
         options_frame = ttk.LabelFrame(query_frame, text="Search Options", padding=10)
@@ -291,7 +636,7 @@ class AFMDWTaskManagementSystem:
         ttk.Label(options_frame, text="Search by:").pack(side=tk.LEFT, padx=5)
         
         self.search_type_var = tk.StringVar()
-        search_types = ["Asset ID", "Asset Name", "Owner", "Status", "Location", "Asset Type"]
+        search_types = list(SEARCH_FIELDS) + [ALL_FIELDS_SEARCH]
         ttk.Combobox(options_frame, textvariable=self.search_type_var, values=search_types, width=20).pack(side=tk.LEFT, padx=5)
         
         self.search_term_var = tk.StringVar()
@@ -330,10 +675,8 @@ class AFMDWTaskManagementSystem:
         results_frame.grid_rowconfigure(0, weight=1)
         results_frame.grid_columnconfigure(0, weight=1)
 
-    def build_reports_tab(self):
+    def build_reports_tab(self, reports_frame):
         """Build the reports and analytics tab."""
-        reports_frame = ttk.Frame(self.notebook)
-        self.notebook.add(reports_frame, text="Reports & Analytics")
         
         # Reports buttons
         button_frame = ttk.LabelFrame(reports_frame, text="Generate Reports", padding=10)
@@ -356,10 +699,8 @@ class AFMDWTaskManagementSystem:
         ttk.Button(export_frame, text="Copy Report", command=self.copy_report).pack(side=tk.LEFT, padx=5)
         ttk.Button(export_frame, text="Export Report", command=self.export_report).pack(side=tk.LEFT, padx=5)
 
-    def build_settings_tab(self):
+    def build_settings_tab(self, settings_frame):
         """Build the settings and configuration tab."""
-        settings_frame = ttk.Frame(self.notebook)
-        self.notebook.add(settings_frame, text="Settings & Tools")
         
         # Owner management
         owner_frame = ttk.LabelFrame(settings_frame, text="Owner Management", padding=10)
@@ -377,7 +718,8 @@ class AFMDWTaskManagementSystem:
         bundle_frame = ttk.LabelFrame(settings_frame, text="Bundled Data Extraction", padding=10)
         bundle_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(bundle_frame, text="Export All as JSON", command=self.export_bundle_json).pack(side=tk.LEFT, padx=5)
+        self.bundle_json_button = ttk.Button(bundle_frame, text="Export All as JSON", command=self.export_bundle_json)
+        self.bundle_json_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(bundle_frame, text="Export All as CSV", command=self.export_bundle_csv).pack(side=tk.LEFT, padx=5)
         ttk.Button(bundle_frame, text="Import from File", command=self.import_bundle).pack(side=tk.LEFT, padx=5)
         
@@ -385,7 +727,8 @@ class AFMDWTaskManagementSystem:
         db_frame = ttk.LabelFrame(settings_frame, text="Database Operations", padding=10)
         db_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(db_frame, text="Backup Data", command=self.backup_data).pack(side=tk.LEFT, padx=5)
+        self.backup_button = ttk.Button(db_frame, text="Backup Data", command=self.backup_data)
+        self.backup_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(db_frame, text="View Task History", command=self.view_task_history).pack(side=tk.LEFT, padx=5)
         ttk.Button(db_frame, text="View Query History", command=self.view_query_history).pack(side=tk.LEFT, padx=5)
         ttk.Button(db_frame, text="Clear Database", command=self.clear_database).pack(side=tk.LEFT, padx=5)
@@ -410,7 +753,6 @@ Features:
 - Data Persistence: SQLite database integration
 - Multi-format Export: CSV and PDF export capabilities
 
-Current Data File: """ + self.data_file + """
 Owners File: """ + self.owners_file + """
 Database File: """ + self.db_file
         
@@ -426,13 +768,16 @@ Database File: """ + self.db_file
         asset = self.build_record_from_form()
         
         # Check for duplicate ID
-        if any(a["id"] == asset["id"] for a in self.assets):
+        if asset["id"] in self._assets_by_id:
             messagebox.showerror("Error", "Asset ID already exists")
             return
         
         self.assets.append(asset)
-        self.save_data()
-        self.refresh_tree()
+        self._index_asset(asset)
+        self.save_asset_record(asset)
+        values = asset_values(asset)
+        self.tree.insert("", tk.END, iid=asset["id"], values=values)
+        self._tree_rows[asset["id"]] = values
         self.clear_form()
         messagebox.showinfo("Success", f"Asset {asset['id']} added successfully")
 
@@ -446,19 +791,24 @@ Database File: """ + self.db_file
         item_values = self.tree.item(selected_item, 'values')
         asset_id = item_values[0]
         
-        # Find and update the asset
-        for asset in self.assets:
-            if asset["id"] == asset_id:
-                updated_asset = self.build_record_from_form()
-                updated_asset["id"] = asset_id
-                self.assets[self.assets.index(asset)] = updated_asset
-                self.save_data()
-                self.refresh_tree()
-                self.clear_form()
-                messagebox.showinfo("Success", f"Asset {asset_id} updated successfully")
-                return
+        asset = self._assets_by_id.get(asset_id)
+        if asset is None:
+            messagebox.showerror("Error", "Asset not found")
+            return
         
-        messagebox.showerror("Error", "Asset not found")
+        # Update the record in place so its list position and identity are kept
+        updated_asset = self.build_record_from_form()
+        updated_asset["id"] = asset_id
+        self._unindex_asset(asset)
+        asset.clear()
+        asset.update(updated_asset)
+        self._index_asset(asset)
+        self.save_asset_record(asset)
+        values = asset_values(asset)
+        self.tree.item(asset_id, values=values)
+        self._tree_rows[asset_id] = values
+        self.clear_form()
+        messagebox.showinfo("Success", f"Asset {asset_id} updated successfully")
 
     def delete_asset(self):
         """Delete an asset from the system."""
@@ -471,9 +821,13 @@ Database File: """ + self.db_file
             item_values = self.tree.item(selected_item, 'values')
             asset_id = item_values[0]
             
-            self.assets = [a for a in self.assets if a["id"] != asset_id]
-            self.save_data()
-            self.refresh_tree()
+            asset = self._assets_by_id.get(asset_id)
+            if asset is not None:
+                self._unindex_asset(asset)
+                self.assets.remove(asset)
+            self.delete_asset_record(asset_id)
+            self.tree.delete(asset_id)
+            self._tree_rows.pop(asset_id, None)
             self.clear_form()
             messagebox.showinfo("Success", f"Asset {asset_id} deleted successfully")
 
@@ -527,42 +881,59 @@ Database File: """ + self.db_file
             selected_item = self.tree.selection()[0]
             item_values = self.tree.item(selected_item, 'values')
             
-            # Find the asset
-            for asset in self.assets:
-                if asset["id"] == item_values[0]:
-                    self.load_selected_record(asset)
-                    return
+            asset = self._assets_by_id.get(item_values[0])
+            if asset is not None:
+                self.load_selected_record(asset)
 
     def refresh_tree(self):
-        """Refresh the asset tree view."""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Add assets
-        for asset in self.assets:
-            values = (
-                asset.get("id", ""),
-                asset.get("name", ""),
-                asset.get("type", ""),
-                asset.get("status", ""),
-                asset.get("owner", ""),
-                asset.get("location", ""),
-                asset.get("acquisition_date", ""),
-                asset.get("release_date", ""),
-                asset.get("cost", ""),
-                asset.get("warranty", ""),
-                asset.get("notes", "")
-            )
-            self.tree.insert("", tk.END, values=values)
+        """Refresh the asset tree view, touching only rows that were added, removed or changed."""
+        rows = {values[0]: values for values in map(asset_values, self.assets)}
+        shown = self._tree_rows
+        removed = shown.keys() - rows.keys()
+        changed = [(index, asset_id, values) for index, (asset_id, values) in enumerate(rows.items())
+                   if shown.get(asset_id) != values]
+        
+        # Hide the tree while repopulating so it is laid out once, not per row
+        if removed or changed:
+            self.tree.grid_remove()
+            if removed:
+                self.tree.delete(*removed)
+            for index, asset_id, values in changed:
+                if asset_id in shown:
+                    self.tree.item(asset_id, values=values)
+                else:
+                    self.tree.insert("", index, iid=asset_id, values=values)
+            self._tree_rows = rows
+        
+        # Kept rows stay where they were, so move them back into list order if
+        # an import reordered the assets or the tree was sorted by a column
+        order = tuple(rows)
+        if self.tree.get_children() != order:
+            self.tree.grid_remove()
+            for index, asset_id in enumerate(order):
+                self.tree.move(asset_id, "", index)
+            self._tree_sort = None
+        self.tree.grid()
         
         # Update owner combobox
         self.update_owner_combobox()
 
+    def sort_tree(self, column):
+        """Sort the asset tree by a column, reversing on repeated clicks, by moving rows in place."""
+        field = ASSET_FIELDS[self.tree["columns"].index(column)]
+        reverse = self._tree_sort == (field, False)
+        self._tree_sort = (field, reverse)
+        
+        keyed = sorted(((tree_sort_key(asset[field]), asset["id"]) for asset in self.assets), reverse=reverse)
+        for index, (_, asset_id) in enumerate(keyed):
+            self.tree.move(asset_id, "", index)
+
     def update_owner_combobox(self):
-        """Update the owner combobox with current owners."""
-        owners_list = list(self.owners.keys()) if self.owners else []
-        self.owner_combobox['values'] = owners_list
+        """Update the owner combobox with current owners, if they changed."""
+        if self._last_owners_version == self._owners_version:
+            return
+        self._last_owners_version = self._owners_version
+        self.owner_combobox['values'] = tuple(self.owners)
 
     def add_owner(self):
         """Add a new owner to the system."""
@@ -576,7 +947,9 @@ Database File: """ + self.db_file
             return
         
         self.owners[owner_name] = {"created_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        self.save_owners()
+        self._owners_version += 1
+        self._owners_dirty = True
+        self._mark_dirty()
         self.update_owner_combobox()
         self.new_owner_var.set("")
         messagebox.showinfo("Success", f"Owner '{owner_name}' added successfully")
@@ -594,7 +967,9 @@ Database File: """ + self.db_file
         
         if messagebox.askyesno("Confirm", f"Remove owner '{owner_name}'?"):
             del self.owners[owner_name]
-            self.save_owners()
+            self._owners_version += 1
+            self._owners_dirty = True
+            self._mark_dirty()
             self.update_owner_combobox()
             self.new_owner_var.set("")
             messagebox.showinfo("Success", f"Owner '{owner_name}' removed successfully")
@@ -609,9 +984,8 @@ Database File: """ + self.db_file
         text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         if self.owners:
-            for owner, details in self.owners.items():
-                text.insert(tk.END, f"Owner: {owner}\n")
-                text.insert(tk.END, f"Created: {details.get('created_date', 'Unknown')}\n\n")
+            text.insert(tk.END, "".join(f"Owner: {owner}\nCreated: {details.get('created_date', 'Unknown')}\n\n"
+                                        for owner, details in self.owners.items()))
         else:
             text.insert(tk.END, "No owners registered yet.")
         
@@ -626,42 +1000,30 @@ Database File: """ + self.db_file
             messagebox.showerror("Error", "Please select search type and enter search term")
             return
         
+        field = SEARCH_FIELDS.get(search_type)
+        if field is None and search_type != ALL_FIELDS_SEARCH:
+            messagebox.showerror("Error", f"Unknown search type: {search_type}")
+            return
+        
         # Clear search tree
         for item in self.search_tree.get_children():
             self.search_tree.delete(item)
         
-        # Perform search
-        results = []
-        for asset in self.assets:
-            match = False
-            
-            if search_type == "Asset ID" and search_term in asset.get("id", "").lower():
-                match = True
-            elif search_type == "Asset Name" and search_term in asset.get("name", "").lower():
-                match = True
-            elif search_type == "Owner" and search_term in asset.get("owner", "").lower():
-                match = True
-            elif search_type == "Status" and search_term in asset.get("status", "").lower():
-                match = True
-            elif search_type == "Location" and search_term in asset.get("location", "").lower():
-                match = True
-            elif search_type == "Asset Type" and search_term in asset.get("type", "").lower():
-                match = True
-            
-            if match:
-                results.append(asset)
+        # Perform search - match against the distinct lowercase values of the
+        # indexed field, or each asset's precomputed lowercase text for an
+        # all-fields search; results follow the asset list order either way
+        if field is None:
+            blobs = self._search_blobs
+            results = [asset for asset in self.assets if search_term in blobs[asset["id"]]]
+        else:
+            matched_ids = {asset_id
+                           for value, bucket in self._search_index[field].items() if search_term in value
+                           for asset_id in bucket}
+            results = [asset for asset in self.assets if asset["id"] in matched_ids]
         
         # Display results
         for asset in results:
-            values = (
-                asset.get("id", ""),
-                asset.get("name", ""),
-                asset.get("type", ""),
-                asset.get("status", ""),
-                asset.get("owner", ""),
-                asset.get("location", "")
-            )
-            self.search_tree.insert("", tk.END, values=values)
+            self.search_tree.insert("", tk.END, values=search_result_values(asset))
         
         messagebox.showinfo("Search Results", f"Found {len(results)} matching asset(s)")
         
@@ -672,26 +1034,24 @@ Database File: """ + self.db_file
         """Open advanced query window."""
         query_window = tk.Toplevel(self.root)
         query_window.title("Advanced Query")
-        query_window.geometry("500x600")
+        query_window.geometry("500x700")
         
         # Query criteria
         criteria_frame = ttk.LabelFrame(query_window, text="Query Criteria", padding=10)
         criteria_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Label(criteria_frame, text="Status:").pack(anchor=tk.W)
-        status_var = tk.StringVar()
-        statuses = ["All", "Active", "Inactive", "In Repair", "Decommissioned", "On Hold"]
-        ttk.Combobox(criteria_frame, textvariable=status_var, values=statuses).pack(fill=tk.X, pady=5)
-        
-        ttk.Label(criteria_frame, text="Asset Type:").pack(anchor=tk.W)
-        type_var = tk.StringVar()
-        types = ["All", "Hardware", "Software", "Network", "Storage", "Peripheral", "Other"]
-        ttk.Combobox(criteria_frame, textvariable=type_var, values=types).pack(fill=tk.X, pady=5)
+        # Multi-select filters; leaving a list unselected matches every value
+        def filter_listbox(label, values):
+            ttk.Label(criteria_frame, text=label).pack(anchor=tk.W)
+            listbox = tk.Listbox(criteria_frame, selectmode=tk.MULTIPLE,
+                                 exportselection=False, height=4)
+            listbox.insert(tk.END, *values)
+            listbox.pack(fill=tk.X, pady=5)
+            return listbox
         
-        ttk.Label(criteria_frame, text="Owner:").pack(anchor=tk.W)
-        owner_var = tk.StringVar()
-        owners_list = ["All"] + list(self.owners.keys())
-        ttk.Combobox(criteria_frame, textvariable=owner_var, values=owners_list).pack(fill=tk.X, pady=5)
+        status_list = filter_listbox("Status:", ["Active", "Inactive", "In Repair", "Decommissioned", "On Hold"])
+        type_list = filter_listbox("Asset Type:", ["Hardware", "Software", "Network", "Storage", "Peripheral", "Other"])
+        owner_list = filter_listbox("Owner:", list(self.owners.keys()))
         
         ttk.Label(criteria_frame, text="Min Cost:").pack(anchor=tk.W)
         min_cost_var = tk.StringVar()
@@ -711,213 +1071,244 @@ Database File: """ + self.db_file
         def execute_query():
             results_text.delete(1.0, tk.END)
             
-            results = self.assets[:]
+            # Read and parse each filter once, and only test the enabled ones
+            costs = self._asset_costs
+            preds = []
+            
+            # Selected values as frozensets for hashed membership tests
+            def selected(listbox):
+                return frozenset(listbox.get(i) for i in listbox.curselection())
             
-            # Apply filters
-            if status_var.get() != "All":
-                results = [a for a in results if a.get("status") == status_var.get()]
+            status_set = selected(status_list)
+            if status_set:
+                preds.append(lambda a: a.get("status") in status_set)
             
-            if type_var.get() != "All":
-                results = [a for a in results if a.get("type") == type_var.get()]
+            type_set = selected(type_list)
+            if type_set:
+                preds.append(lambda a: a.get("type") in type_set)
             
-            if owner_var.get() != "All":
-                results = [a for a in results if a.get("owner") == owner_var.get()]
+            owner_set = selected(owner_list)
+            if owner_set:
+                preds.append(lambda a: a.get("owner") in owner_set)
             
             try:
                 if min_cost_var.get():
                     min_cost = float(min_cost_var.get())
-                    results = [a for a in results if float(a.get("cost", 0) or 0) >= min_cost]
+                    preds.append(lambda a: costs[a["id"]] >= min_cost)
             except ValueError:
                 pass
             
             try:
                 if max_cost_var.get():
                     max_cost = float(max_cost_var.get())
-                    results = [a for a in results if float(a.get("cost", 0) or 0) <= max_cost]
+                    preds.append(lambda a: costs[a["id"]] <= max_cost)
             except ValueError:
                 pass
             
-            # Display results
-            results_text.insert(tk.END, f"Found {len(results)} asset(s)\n\n")
+            # Take the smallest set of candidate IDs the field indexes give for
+            # the selected values, so the full filters only run on those assets;
+            # walking the asset list keeps results in list order
+            candidate_ids = None
+            for field, value_set in (("status", status_set), ("type", type_set), ("owner", owner_set)):
+                if value_set:
+                    index = self._search_index[field]
+                    ids = {asset_id for key in {v.lower() for v in value_set} for asset_id in index.get(key, ())}
+                    if candidate_ids is None or len(ids) < len(candidate_ids):
+                        candidate_ids = ids
+            
+            if candidate_ids is None:
+                results = [a for a in self.assets if all(p(a) for p in preds)]
+            else:
+                results = [a for a in self.assets if a["id"] in candidate_ids and all(p(a) for p in preds)]
+            
+            # Display results with a single widget insert
+            parts = [f"Found {len(results)} asset(s)\n\n"]
             for asset in results:
-                results_text.insert(tk.END, f"ID: {asset.get('id')}\n")
-                results_text.insert(tk.END, f"Name: {asset.get('name')}\n")
-                results_text.insert(tk.END, f"Type: {asset.get('type')}\n")
-                results_text.insert(tk.END, f"Status: {asset.get('status')}\n")
-                results_text.insert(tk.END, f"Owner: {asset.get('owner')}\n")
-                results_text.insert(tk.END, f"Location: {asset.get('location')}\n")
-                results_text.insert(tk.END, f"Cost: {asset.get('cost')}\n")
-                results_text.insert(tk.END, "-" * 40 + "\n\n")
+                parts.append(f"ID: {asset.get('id')}\n"
+                             f"Name: {asset.get('name')}\n"
+                             f"Type: {asset.get('type')}\n"
+                             f"Status: {asset.get('status')}\n"
+                             f"Owner: {asset.get('owner')}\n"
+                             f"Location: {asset.get('location')}\n"
+                             f"Cost: {asset.get('cost')}\n"
+                             + "-" * 40 + "\n\n")
+            results_text.insert(tk.END, "".join(parts))
         
         ttk.Button(criteria_frame, text="Execute Query", command=execute_query).pack(side=tk.LEFT, padx=5, pady=10)
 
+    def _memo(self, key, fn):
+        """Return the cached result of fn for the current asset version."""
+        cache_key = (key, self._assets_version)
+        if cache_key in self._report_cache:
+            return self._report_cache[cache_key]
+        result = fn()
+        self._report_cache[cache_key] = result
+        return result
+
+    def _report_header(self, title):
+        """Build the banner that starts every report."""
+        return "".join([
+            "=" * 60 + "\n",
+            f"{title}\n",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            "=" * 60 + "\n\n"
+        ])
+
     def generate_summary_report(self):
         """Generate a summary report of all assets."""
-        report = "=" * 60 + "\n"
-        report += "ASSET SUMMARY REPORT\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += "=" * 60 + "\n\n"
-        
-        report += f"Total Assets: {len(self.assets)}\n"
-        
-        if self.assets:
-            total_cost = sum(float(a.get("cost", 0) or 0) for a in self.assets)
-            report += f"Total Cost: ${total_cost:,.2f}\n\n"
-            
-            # Assets by type
-            types = {}
-            for asset in self.assets:
-                asset_type = asset.get("type", "Unknown")
-                types[asset_type] = types.get(asset_type, 0) + 1
-            
-            report += "Assets by Type:\n"
-            for asset_type, count in sorted(types.items()):
-                report += f"  {asset_type}: {count}\n"
+        def build():
+            parts = [f"Total Assets: {len(self.assets)}\n"]
             
-            report += "\nAssets by Status:\n"
-            statuses = {}
-            for asset in self.assets:
-                status = asset.get("status", "Unknown")
-                statuses[status] = statuses.get(status, 0) + 1
-            
-            for status, count in sorted(statuses.items()):
-                report += f"  {status}: {count}\n"
+            if self.assets:
+                # Assets per type come from the cost index; the rest runs in C
+                types = {asset_type: len(costs) for asset_type, costs in self._type_asset_costs.items()}
+                statuses = Counter(asset.get("status", "Unknown") for asset in self.assets)
+                total_cost = math.fsum(self._asset_costs.values())
+                
+                parts.append(f"Total Cost: ${total_cost:,.2f}\n\n")
+                
+                parts.append("Assets by Type:\n")
+                for asset_type, count in sorted(types.items()):
+                    parts.append(f"  {asset_type}: {count}\n")
+                
+                parts.append("\nAssets by Status:\n")
+                for status, count in sorted(statuses.items()):
+                    parts.append(f"  {status}: {count}\n")
+            return "".join(parts)
+        
+        report = self._report_header("ASSET SUMMARY REPORT") + self._memo("summary", build)
         
         self.report_text.delete(1.0, tk.END)
         self.report_text.insert(tk.END, report)
 
     def generate_owner_report(self):
         """Generate a report on asset distribution by owner."""
-        report = "=" * 60 + "\n"
-        report += "OWNER DISTRIBUTION REPORT\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += "=" * 60 + "\n\n"
+        def build():
+            parts = []
+            # Group assets and sum their costs per owner in the same pass
+            costs = self._asset_costs
+            owners_assets = defaultdict(list)
+            owners_costs = {}
+            costs_get = owners_costs.get
+            for asset in self.assets:
+                owner = asset.get("owner", "Unassigned")
+                owners_assets[owner].append(asset)
+                owners_costs[owner] = costs_get(owner, 0.0) + costs[asset["id"]]
+            
+            if owners_assets:
+                for owner, assets in sorted(owners_assets.items()):
+                    parts.append(f"\nOwner: {owner}\n")
+                    parts.append(f"  Total Assets: {len(assets)}\n")
+                    parts.append(f"  Total Cost: ${owners_costs[owner]:,.2f}\n")
+                    parts.append("  Assets:\n")
+                    for asset in assets:
+                        parts.append(f"    - {asset.get('name')} ({asset.get('id')})\n")
+            else:
+                parts.append("No assets assigned to owners.\n")
+            return "".join(parts)
         
-        owners_assets = {}
-        for asset in self.assets:
-            owner = asset.get("owner", "Unassigned")
-            if owner not in owners_assets:
-                owners_assets[owner] = []
-            owners_assets[owner].append(asset)
-        
-        if owners_assets:
-            for owner, assets in sorted(owners_assets.items()):
-                report += f"\nOwner: {owner}\n"
-                report += f"  Total Assets: {len(assets)}\n"
-                total_cost = sum(float(a.get("cost", 0) or 0) for a in assets)
-                report += f"  Total Cost: ${total_cost:,.2f}\n"
-                report += "  Assets:\n"
-                for asset in assets:
-                    report += f"    - {asset.get('name')} ({asset.get('id')})\n"
-        else:
-            report += "No assets assigned to owners.\n"
+        report = self._report_header("OWNER DISTRIBUTION REPORT") + self._memo("owner", build)
         
         self.report_text.delete(1.0, tk.END)
         self.report_text.insert(tk.END, report)
 
     def generate_status_report(self):
         """Generate a report on asset status."""
-        report = "=" * 60 + "\n"
-        report += "ASSET STATUS REPORT\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += "=" * 60 + "\n\n"
+        def build():
+            parts = []
+            statuses = defaultdict(list)
+            for asset in self.assets:
+                statuses[asset.get("status", "Unknown")].append(asset)
+            
+            if statuses:
+                for status, assets in sorted(statuses.items()):
+                    parts.append(f"\n{status}: {len(assets)} asset(s)\n")
+                    for asset in assets:
+                        parts.append(f"  - {asset.get('name')} (ID: {asset.get('id')})\n")
+            else:
+                parts.append("No assets found.\n")
+            return "".join(parts)
         
-        statuses = {}
-        for asset in self.assets:
-            status = asset.get("status", "Unknown")
-            if status not in statuses:
-                statuses[status] = []
-            statuses[status].append(asset)
-        
-        if statuses:
-            for status, assets in sorted(statuses.items()):
-                report += f"\n{status}: {len(assets)} asset(s)\n"
-                for asset in assets:
-                    report += f"  - {asset.get('name')} (ID: {asset.get('id')})\n"
-        else:
-            report += "No assets found.\n"
+        report = self._report_header("ASSET STATUS REPORT") + self._memo("status", build)
         
         self.report_text.delete(1.0, tk.END)
         self.report_text.insert(tk.END, report)
 
     def generate_warranty_report(self):
         """Generate a warranty status report."""
-        report = "=" * 60 + "\n"
-        report += "WARRANTY STATUS REPORT\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += "=" * 60 + "\n\n"
+        today = datetime.now()
         
-        if not self.assets:
-            report += "No assets found.\n"
-        else:
-            today = datetime.now()
+        def build():
+            if not self.assets:
+                return "No assets found.\n"
+            
             expiring_soon = []
             expired = []
-            valid = []
+            valid_count = 0
             
+            # Expiry dates are precomputed per asset; classify them against two
+            # cutoffs and only work out day counts for the assets that are listed
+            soon_cutoff = today + timedelta(days=91)
+            expiries = self._warranty_expiry
             for asset in self.assets:
-                try:
-                    acq_date = datetime.strptime(asset.get("acquisition_date", ""), "%Y-%m-%d")
-                    warranty_months = int(asset.get("warranty", 0) or 0)
-                    expiry_date = acq_date + relativedelta(months=warranty_months)
-                    
-                    days_until_expiry = (expiry_date - today).days
-                    
-                    if days_until_expiry < 0:
-                        expired.append((asset, expiry_date, days_until_expiry))
-                    elif days_until_expiry <= 90:
-                        expiring_soon.append((asset, expiry_date, days_until_expiry))
-                    else:
-                        valid.append((asset, expiry_date, days_until_expiry))
-                except:
-                    pass
+                expiry_date = expiries.get(asset["id"])
+                if expiry_date is None:
+                    continue
+                
+                if expiry_date >= soon_cutoff:
+                    valid_count += 1
+                elif expiry_date < today:
+                    expired.append((asset, expiry_date, (expiry_date - today).days))
+                else:
+                    expiring_soon.append((asset, expiry_date, (expiry_date - today).days))
             
-            report += f"Valid Warranty: {len(valid)}\n"
-            report += f"Expiring Soon (< 90 days): {len(expiring_soon)}\n"
-            report += f"Expired: {len(expired)}\n\n"
+            parts = [
+                f"Valid Warranty: {valid_count}\n",
+                f"Expiring Soon (< 90 days): {len(expiring_soon)}\n",
+                f"Expired: {len(expired)}\n\n"
+            ]
             
             if expired:
-                report += "EXPIRED WARRANTIES:\n"
+                parts.append("EXPIRED WARRANTIES:\n")
                 for asset, expiry_date, days in expired:
-                    report += f"  - {asset.get('name')} (expired {abs(days)} days ago)\n"
+                    parts.append(f"  - {asset.get('name')} (expired {abs(days)} days ago)\n")
             
             if expiring_soon:
-                report += "\nEXPIRING SOON:\n"
+                parts.append("\nEXPIRING SOON:\n")
                 for asset, expiry_date, days in expiring_soon:
-                    report += f"  - {asset.get('name')} (expires in {days} days)\n"
+                    parts.append(f"  - {asset.get('name')} (expires in {days} days)\n")
+            return "".join(parts)
+        
+        # Days-until-expiry depend on the current date, so cache per day
+        report = self._report_header("WARRANTY STATUS REPORT") + self._memo(("warranty", today.date()), build)
         
         self.report_text.delete(1.0, tk.END)
         self.report_text.insert(tk.END, report)
 
     def generate_cost_report(self):
         """Generate a cost analysis report."""
-        report = "=" * 60 + "\n"
-        report += "COST ANALYSIS REPORT\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += "=" * 60 + "\n\n"
-        
-        if not self.assets:
-            report += "No assets found.\n"
-        else:
-            total_cost = sum(float(a.get("cost", 0) or 0) for a in self.assets)
-            avg_cost = total_cost / len(self.assets) if self.assets else 0
+        def build():
+            if not self.assets:
+                return "No assets found.\n"
             
-            report += f"Total Assets: {len(self.assets)}\n"
-            report += f"Total Cost: ${total_cost:,.2f}\n"
-            report += f"Average Cost: ${avg_cost:,.2f}\n\n"
-            
-            # Cost by type
-            cost_by_type = {}
-            for asset in self.assets:
-                asset_type = asset.get("type", "Unknown")
-                cost = float(asset.get("cost", 0) or 0)
-                if asset_type not in cost_by_type:
-                    cost_by_type[asset_type] = 0
-                cost_by_type[asset_type] += cost
+            # Costs are already grouped per type by the asset indexes; fsum
+            # keeps every total exact however the assets were edited
+            cost_by_type = {asset_type: math.fsum(costs.values())
+                            for asset_type, costs in self._type_asset_costs.items()}
+            total_cost = math.fsum(self._asset_costs.values())
+            avg_cost = total_cost / len(self.assets)
             
-            report += "Cost by Type:\n"
+            parts = [
+                f"Total Assets: {len(self.assets)}\n",
+                f"Total Cost: ${total_cost:,.2f}\n",
+                f"Average Cost: ${avg_cost:,.2f}\n\n",
+                "Cost by Type:\n"
+            ]
             for asset_type, cost in sorted(cost_by_type.items(), key=lambda x: x[1], reverse=True):
-                report += f"  {asset_type}: ${cost:,.2f}\n"
+                parts.append(f"  {asset_type}: ${cost:,.2f}\n")
+            return "".join(parts)
+        
+        report = self._report_header("COST ANALYSIS REPORT") + self._memo("cost", build)
         
         self.report_text.delete(1.0, tk.END)
         self.report_text.insert(tk.END, report)
@@ -950,13 +1341,7 @@ Database File: """ + self.db_file
         item_values = self.tree.item(selected_item, 'values')
         asset_id = item_values[0]
         
-        # Find the asset
-        asset = None
-        for a in self.assets:
-            if a["id"] == asset_id:
-                asset = a
-                break
-        
+        asset = self._assets_by_id.get(asset_id)
         if not asset:
             messagebox.showerror("Error", "Asset not found")
             return
@@ -965,54 +1350,56 @@ Database File: """ + self.db_file
         if not file_path:
             return
         
-        try:
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            story = []
-            
-            # Title
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#1f77b4'),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            story.append(Paragraph("Asset Report", title_style))
-            story.append(Spacer(1, 0.3 * inch))
-            
-            # Asset details
-            data = [
-                ["Asset ID", asset.get("id", "")],
-                ["Name", asset.get("name", "")],
-                ["Type", asset.get("type", "")],
-                ["Status", asset.get("status", "")],
-                ["Owner", asset.get("owner", "")],
-                ["Location", asset.get("location", "")],
-                ["Acquisition Date", asset.get("acquisition_date", "")],
-                ["Release Date", asset.get("release_date", "")],
-                ["Cost", f"${float(asset.get('cost', 0) or 0):,.2f}"],
-                ["Warranty (months)", asset.get("warranty", "")],
-                ["Notes", asset.get("notes", "")]
-            ]
-            
-            table = Table(data, colWidths=[2 * inch, 4 * inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(table)
-            
-            doc.build(story)
+        # Build the PDF off the Tk main thread from a snapshot of the record
+        asset = dict(asset)
+        
+        def job():
+            try:
+                self.build_asset_pdf(file_path, asset)
+            except Exception as e:
+                error = f"Failed to export PDF: {e}"
+                self.root.after(0, lambda: self._finish_pdf_export(error))
+            else:
+                self.root.after(0, self._finish_pdf_export)
+        
+        self.pdf_button.config(state=tk.DISABLED)
+        self.pdf_progress.pack(side=tk.LEFT, padx=5)
+        self.pdf_progress.start()
+        threading.Thread(target=job, daemon=True).start()
+
+    def _finish_pdf_export(self, error=None):
+        """Restore the export controls and report the outcome of a PDF export."""
+        self.pdf_progress.stop()
+        self.pdf_progress.pack_forget()
+        self.pdf_button.config(state=tk.NORMAL)
+        if error:
+            messagebox.showerror("Error", error)
+        else:
             messagebox.showinfo("Success", "PDF exported successfully")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export PDF: {e}")
+
+    def build_asset_pdf(self, file_path, asset):
+        """Write a single-asset PDF report; safe to call from a worker thread."""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+        
+        title_style, table_style = pdf_styles()
+        doc = SimpleDocTemplate(file_path, pagesize=letter)
+        story = []
+        
+        # Title
+        story.append(Paragraph("Asset Report", title_style))
+        story.append(Spacer(1, 0.3 * inch))
+        
+        # Asset details
+        data = [[label, f"${float(asset.get(field, 0) or 0):,.2f}" if field == "cost" else asset.get(field, "")]
+                for label, field in PDF_FIELDS]
+        
+        table = Table(data, colWidths=[2 * inch, 4 * inch])
+        table.setStyle(table_style)
+        story.append(table)
+        
+        doc.build(story)
 
     def export_to_csv(self):
         """Export all assets to CSV file."""
@@ -1021,40 +1408,64 @@ Database File: """ + self.db_file
             return
         
         try:
-            with open(file_path, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=self.assets[0].keys() if self.assets else [])
-                writer.writeheader()
-                writer.writerows(self.assets)
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(ASSET_FIELDS)
+                writer.writerows(map(asset_values, self.assets))
             messagebox.showinfo("Success", "CSV exported successfully")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export CSV: {e}")
 
+    def _snapshot_assets(self):
+        """Copy the asset records so a worker thread never sees them change mid-write."""
+        return [dict(asset) for asset in self.assets]
+
+    def _run_in_background(self, button, job, success_message, error_prefix):
+        """Run job on a worker thread with button disabled, reporting back on the Tk thread."""
+        def finish(error=None):
+            button.config(state=tk.NORMAL)
+            if error:
+                messagebox.showerror("Error", error)
+            else:
+                messagebox.showinfo("Success", success_message)
+        
+        def worker():
+            try:
+                job()
+            except Exception as e:
+                error = f"{error_prefix}: {e}"
+                self.root.after(0, lambda: finish(error))
+            else:
+                self.root.after(0, finish)
+        
+        button.config(state=tk.DISABLED)
+        threading.Thread(target=worker, daemon=True).start()
+
     def export_bundle_json(self):
         """Export all data as bundled JSON."""
         file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
         if not file_path:
             return
         
-        try:
-            bundle = {
-                "assets": self.assets,
-                "owners": self.owners,
-                "export_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            with open(file_path, 'w') as f:
-                json.dump(bundle, f, indent=4)
-            messagebox.showinfo("Success", "Data exported successfully")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export data: {e}")
+        bundle = {
+            "assets": self._snapshot_assets(),
+            "owners": dict(self.owners),
+            "export_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self._run_in_background(self.bundle_json_button,
+                                lambda: write_json_file(file_path, bundle, indent=True),
+                                "Data exported successfully", "Failed to export data")
 
     def export_bundle_csv(self):
-        """Export assets as bundled CSV with metadata."""
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        """Export assets as bundled CSV with metadata, gzip-compressed for .gz paths."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
+                                                 filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")])
         if not file_path:
             return
         
+        opener = gzip.open if file_path.endswith('.gz') else open
         try:
-            with open(file_path, 'w', newline='') as f:
+            with opener(file_path, 'wt', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 
                 # Header with metadata
@@ -1065,16 +1476,13 @@ Database File: """ + self.db_file
                 # Asset data
                 writer.writerow(["ASSETS"])
                 if self.assets:
-                    fieldnames = list(self.assets[0].keys())
-                    writer.writerow(fieldnames)
-                    for asset in self.assets:
-                        writer.writerow([asset.get(field, "") for field in fieldnames])
+                    writer.writerow(ASSET_FIELDS)
+                    writer.writerows(map(asset_values, self.assets))
                 
                 writer.writerow([])
                 writer.writerow(["OWNERS"])
                 writer.writerow(["Owner", "Created Date"])
-                for owner, details in self.owners.items():
-                    writer.writerow([owner, details.get("created_date", "")])
+                writer.writerows((owner, details.get("created_date", "")) for owner, details in self.owners.items())
             
             messagebox.showinfo("Success", "Bundle exported successfully")
         except Exception as e:
@@ -1082,51 +1490,75 @@ Database File: """ + self.db_file
 
     def import_bundle(self):
         """Import bundled data from file."""
-        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv")])
+        file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("Compressed JSON files", "*.json.gz"),
+                                                          ("CSV files", "*.csv")])
         if not file_path:
             return
         
         try:
-            if file_path.endswith('.json'):
-                with open(file_path, 'r') as f:
-                    bundle = json.load(f)
-                    self.assets = bundle.get("assets", [])
-                    self.owners = bundle.get("owners", {})
+            if file_path.endswith(('.json', '.json.gz')):
+                bundle = read_json_file(file_path)
+                assets, missing_ids, duplicates = normalize_assets(bundle.get("assets", []))
+                owners = bundle.get("owners", {})
             else:
                 messagebox.showerror("Error", "CSV import not yet implemented for complex data")
                 return
             
-            self.save_data()
-            self.save_owners()
+            # Only rewrite what the bundle actually changes; re-importing a
+            # backup of the current data costs a comparison, not a rewrite
+            if assets != self.assets:
+                # Commit deferred upserts and query-log rows first, so a failed
+                # rewrite rolls back only itself and not edits still on screen
+                self.conn.commit()
+                previous = self.assets
+                self.assets = assets
+                self._invalidate_reports()
+                try:
+                    self.rebuild_indexes()
+                    self._write_all_assets()
+                except Exception:
+                    # Swap the previous assets and their indexes back in, so a
+                    # failed import leaves memory matching the database and tree
+                    self.assets = previous
+                    self.rebuild_indexes()
+                    raise
+            if owners != self.owners:
+                self.owners = owners
+                self._owners_version += 1
+                self._owners_dirty = True
+                self._mark_dirty()
             self.refresh_tree()
-            messagebox.showinfo("Success", "Data imported successfully")
+            message = "Data imported successfully"
+            if missing_ids:
+                message += f"\nSkipped {missing_ids} record(s) without an asset ID"
+            if duplicates:
+                message += f"\nMerged {duplicates} record(s) with a duplicate asset ID (the last one was kept)"
+            messagebox.showinfo("Success", message)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to import data: {e}")
 
     def backup_data(self):
         """Create a backup of all data."""
-        backup_file = f"afmdw_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        backup_file = f"afmdw_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
         
-        try:
-            bundle = {
-                "assets": self.assets,
-                "owners": self.owners,
-                "backup_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            with open(backup_file, 'w') as f:
-                json.dump(bundle, f, indent=4)
-            messagebox.showinfo("Success", f"Backup created: {backup_file}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create backup: {e}")
+        bundle = {
+            "assets": self._snapshot_assets(),
+            "owners": dict(self.owners),
+            "backup_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        # Backups are for restoring, not reading, so write them compact and gzipped
+        self._run_in_background(self.backup_button,
+                                lambda: write_json_file(backup_file, bundle),
+                                f"Backup created: {backup_file}", "Failed to create backup")
 
     def view_task_history(self):
         """View task history from database."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            c.execute("SELECT * FROM tasks ORDER BY created_date DESC LIMIT 50")
+            c = self.conn.cursor()
+            c.row_factory = sqlite3.Row
+            c.execute("""SELECT asset_id, task_type, description, status, created_date, due_date
+                         FROM tasks ORDER BY created_date DESC LIMIT 50""")
             tasks = c.fetchall()
-            conn.close()
             
             history_window = tk.Toplevel(self.root)
             history_window.title("Task History")
@@ -1136,14 +1568,14 @@ Database File: """ + self.db_file
             text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
             
             if tasks:
-                for task in tasks:
-                    text.insert(tk.END, f"Asset ID: {task[1]}\n")
-                    text.insert(tk.END, f"Type: {task[2]}\n")
-                    text.insert(tk.END, f"Description: {task[3]}\n")
-                    text.insert(tk.END, f"Status: {task[4]}\n")
-                    text.insert(tk.END, f"Created: {task[5]}\n")
-                    text.insert(tk.END, f"Due: {task[6]}\n")
-                    text.insert(tk.END, "-" * 40 + "\n\n")
+                text.insert(tk.END, "".join(f"Asset ID: {task['asset_id']}\n"
+                                            f"Type: {task['task_type']}\n"
+                                            f"Description: {task['description']}\n"
+                                            f"Status: {task['status']}\n"
+                                            f"Created: {task['created_date']}\n"
+                                            f"Due: {task['due_date']}\n"
+                                            + "-" * 40 + "\n\n"
+                                            for task in tasks))
             else:
                 text.insert(tk.END, "No task history found.")
             
@@ -1154,11 +1586,11 @@ Database File: """ + self.db_file
     def view_query_history(self):
         """View query history from database."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            c.execute("SELECT * FROM query_history ORDER BY created_date DESC LIMIT 50")
+            c = self.conn.cursor()
+            c.row_factory = sqlite3.Row
+            c.execute("""SELECT query_type, query_params, created_date, results
+                         FROM query_history ORDER BY created_date DESC LIMIT 50""")
             queries = c.fetchall()
-            conn.close()
             
             history_window = tk.Toplevel(self.root)
             history_window.title("Query History")
@@ -1168,12 +1600,12 @@ Database File: """ + self.db_file
             text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
             
             if queries:
-                for query in queries:
-                    text.insert(tk.END, f"Query Type: {query[1]}\n")
-                    text.insert(tk.END, f"Parameters: {query[2]}\n")
-                    text.insert(tk.END, f"Created: {query[3]}\n")
-                    text.insert(tk.END, f"Results: {query[4]}\n")
-                    text.insert(tk.END, "-" * 40 + "\n\n")
+                text.insert(tk.END, "".join(f"Query Type: {query['query_type']}\n"
+                                            f"Parameters: {query['query_params']}\n"
+                                            f"Created: {query['created_date']}\n"
+                                            f"Results: {query['results']}\n"
+                                            + "-" * 40 + "\n\n"
+                                            for query in queries))
             else:
                 text.insert(tk.END, "No query history found.")
             
@@ -1182,15 +1614,13 @@ Database File: """ + self.db_file
             messagebox.showerror("Error", f"Failed to view query history: {e}")
 
     def log_query(self, query_type, params, results_count):
-        """Log a query to the database."""
+        """Log a query to the database; committed with the next deferred flush."""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
+            c = self.conn.cursor()
             c.execute('''INSERT INTO query_history (query_type, query_params, created_date, results)
                          VALUES (?, ?, ?, ?)''',
                       (query_type, json.dumps(params), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), str(results_count)))
-            conn.commit()
-            conn.close()
+            self._mark_dirty()
         except Exception as e:
             print(f"Failed to log query: {e}")
 
@@ -1198,12 +1628,10 @@ Database File: """ + self.db_file
         """Clear the database (with confirmation)."""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear the entire database? This cannot be undone."):
             try:
-                conn = sqlite3.connect(self.db_file)
-                c = conn.cursor()
+                c = self.conn.cursor()
                 c.execute("DELETE FROM tasks")
                 c.execute("DELETE FROM query_history")
-                conn.commit()
-                conn.close()
+                self.conn.commit()
                 messagebox.showinfo("Success", "Database cleared successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to clear database: {e}")